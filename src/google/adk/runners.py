@@ -15,16 +15,16 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import inspect
 import logging
-import queue
-import time
+import threading
 from typing import Any
 from typing import AsyncGenerator
 from typing import Callable
 from typing import Generator
 from typing import List
 from typing import Optional
-import uuid
 import warnings
 
 from google.genai import types
@@ -56,6 +56,73 @@ from .tools.base_toolset import BaseToolset
 
 logger = logging.getLogger('google_adk.' + __name__)
 
+# Max number of events buffered between the shared loop and a sync caller.
+_RUN_SYNC_QUEUE_MAXSIZE = 256
+
+
+class _RunSyncLoop:
+  """A background event loop shared by all sync `Runner.run` calls.
+
+  The loop and its daemon thread are started lazily on first use and reused
+  afterwards, so sync callers don't pay thread and event loop startup costs on
+  every run.
+  """
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+  def get_loop(self) -> asyncio.AbstractEventLoop:
+    """Returns the shared event loop, starting it if necessary."""
+    with self._lock:
+      if self._loop is None:
+        loop = asyncio.new_event_loop()
+        thread = create_thread(target=loop.run_forever)
+        thread.daemon = True
+        thread.start()
+        self._loop = loop
+      return self._loop
+
+
+_run_sync_loop = _RunSyncLoop()
+
+
+@functools.lru_cache(maxsize=1024)
+def _uses_live_request_queue(func: Callable[..., Any]) -> bool:
+  # We use `inspect.signature()` to examine the tool's underlying function.
+  # This approach is deliberately chosen over `typing.get_type_hints()` for
+  # robustness.
+  #
+  # The Problem with `get_type_hints()`:
+  # `get_type_hints()` attempts to resolve forward-referenced (string-based)
+  # type annotations. This resolution can easily fail with a `NameError`
+  # (e.g., "Union not found") if the type isn't available in the scope where
+  # `get_type_hints()` is called. This is a common and brittle issue in
+  # framework code that inspects functions defined in separate user modules.
+  #
+  # Why `inspect.signature()` is Better Here:
+  # `inspect.signature()` does NOT resolve the annotations; it retrieves the
+  # raw annotation object as it was defined on the function. This allows us
+  # to perform a direct and reliable identity check
+  # (`param.annotation is LiveRequestQueue`) without risking a `NameError`.
+  return any(
+      param.annotation is LiveRequestQueue
+      for param in inspect.signature(func).parameters.values()
+  )
+
+
+def _accepts_live_request_queue(func: Callable[..., Any]) -> bool:
+  """Whether the tool function takes a `LiveRequestQueue` parameter.
+
+  The result is cached per function since building signatures is expensive
+  and the same tools are inspected on every live run.
+  """
+  try:
+    return _uses_live_request_queue(func)
+  except TypeError:
+    # Unhashable callables can't be cached.
+    return _uses_live_request_queue.__wrapped__(func)
+
 
 class Runner:
   """The Runner class is used to run agents.
@@ -115,6 +182,11 @@ class Runner:
     self.memory_service = memory_service
     self.credential_service = credential_service
     self.plugin_manager = PluginManager(plugins=plugins)
+    self._agents_by_name: dict[str, BaseAgent] = {}
+    self._agents_by_name_root: Optional[BaseAgent] = None
+    self._transferable_cache: dict[int, tuple[BaseAgent, bool]] = {}
+    self._cached_toolsets: Optional[set[BaseToolset]] = None
+    self._agent_model_name: Optional[tuple[BaseAgent, str]] = None
 
   def run(
       self,
@@ -139,9 +211,21 @@ class Runner:
     Yields:
       The events generated by the agent.
     """
-    event_queue = queue.Queue()
+    loop = _run_sync_loop.get_loop()
+    consumer_done = threading.Event()
+
+    async def _new_event_queue() -> asyncio.Queue[Optional[Event]]:
+      # Bounded so that a fast producer can't outgrow a slow consumer.
+      return asyncio.Queue(maxsize=_RUN_SYNC_QUEUE_MAXSIZE)
 
-    async def _invoke_run_async():
+    # The queue is created on the shared loop, which it must be bound to.
+    event_queue = asyncio.run_coroutine_threadsafe(
+        _new_event_queue(), loop
+    ).result()
+
+    # The whole run is driven by a single task on the shared loop so that
+    # context variables (e.g. the tracing span) stay valid across events.
+    async def _forward_events():
       try:
         async for event in self.run_async(
             user_id=user_id,
@@ -149,28 +233,43 @@ class Runner:
             new_message=new_message,
             run_config=run_config,
         ):
-          event_queue.put(event)
+          await event_queue.put(event)
       finally:
-        event_queue.put(None)
-
-    def _asyncio_thread_main():
-      try:
-        asyncio.run(_invoke_run_async())
-      finally:
-        event_queue.put(None)
-
-    thread = create_thread(target=_asyncio_thread_main)
-    thread.start()
-
-    # consumes and re-yield the events from background thread.
-    while True:
-      event = event_queue.get()
-      if event is None:
-        break
-      else:
-        yield event
-
-    thread.join()
+        # Nobody waits for the end of the run once the caller stopped early.
+        if not consumer_done.is_set():
+          await event_queue.put(None)
+
+    async def _get_events() -> list[Optional[Event]]:
+      # Drains all the ready events at once to amortize the round trips
+      # between the caller thread and the shared loop.
+      events = [await event_queue.get()]
+      while not event_queue.empty():
+        events.append(event_queue.get_nowait())
+      return events
+
+    future = asyncio.run_coroutine_threadsafe(_forward_events(), loop)
+    get_events_future = None
+    try:
+      # consumes and re-yield the events from the shared loop.
+      while True:
+        get_events_future = asyncio.run_coroutine_threadsafe(
+            _get_events(), loop
+        )
+        events = get_events_future.result()
+        for event in events:
+          if event is None:
+            break
+          yield event
+        if events[-1] is None:
+          break
+      # Surfaces any error raised while running the agent.
+      future.result()
+    finally:
+      consumer_done.set()
+      # No-ops if the run has already finished, e.g. the caller stopped early.
+      if get_events_future:
+        get_events_future.cancel()
+      future.cancel()
 
   async def run_async(
       self,
@@ -207,13 +306,15 @@ class Runner:
       root_agent = self.agent
 
       # Modify user message before execution.
-      modified_user_message = (
-          await invocation_context.plugin_manager.run_on_user_message_callback(
-              invocation_context=invocation_context, user_message=new_message
-          )
-      )
-      if modified_user_message is not None:
-        new_message = modified_user_message
+      plugin_manager = invocation_context.plugin_manager
+      if plugin_manager.plugins:
+        modified_user_message = (
+            await plugin_manager.run_on_user_message_callback(
+                invocation_context=invocation_context, user_message=new_message
+            )
+        )
+        if modified_user_message is not None:
+          new_message = modified_user_message
 
       if new_message:
         await self._append_new_message_to_session(
@@ -226,12 +327,10 @@ class Runner:
 
       invocation_context.agent = self._find_agent_to_run(session, root_agent)
 
-      async def execute(ctx: InvocationContext) -> AsyncGenerator[Event]:
-        async for event in ctx.agent.run_async(ctx):
-          yield event
-
       async for event in self._exec_with_plugin(
-          invocation_context, session, execute
+          invocation_context,
+          session,
+          invocation_context.agent.run_async(invocation_context),
       ):
         yield event
 
@@ -239,20 +338,31 @@ class Runner:
       self,
       invocation_context: InvocationContext,
       session: Session,
-      execute_fn: Callable[[InvocationContext], AsyncGenerator[Event, None]],
+      execute_gen: AsyncGenerator[Event, None],
   ) -> AsyncGenerator[Event, None]:
     """Wraps execution with plugin callbacks.
 
     Args:
       invocation_context: The invocation context
       session: The current session
-      execute_fn: A callable that returns an AsyncGenerator of Events
+      execute_gen: The AsyncGenerator of Events of the agent execution
 
     Yields:
       Events from the execution, including any generated by plugins
     """
 
     plugin_manager = invocation_context.plugin_manager
+    # Bound once since they are called for every event below.
+    append_event = self.session_service.append_event
+    on_event_callback = plugin_manager.run_on_event_callback
+
+    if not plugin_manager.plugins:
+      # Fast path: skips the plugin callbacks when no plugin is registered.
+      async for event in execute_gen:
+        if not event.partial:
+          await append_event(session=session, event=event)
+        yield event
+      return
 
     # Step 1: Run the before_run callbacks to see if we should early exit.
     early_exit_result = await plugin_manager.run_before_run_callback(
@@ -264,18 +374,15 @@ class Runner:
           author='model',
           content=early_exit_result,
       )
-      await self.session_service.append_event(
-          session=session,
-          event=early_exit_event,
-      )
+      await append_event(session=session, event=early_exit_event)
       yield early_exit_event
     else:
       # Step 2: Otherwise continue with normal execution
-      async for event in execute_fn(invocation_context):
+      async for event in execute_gen:
         if not event.partial:
-          await self.session_service.append_event(session=session, event=event)
+          await append_event(session=session, event=event)
         # Step 3: Run the on_event callbacks to optionally modify the event.
-        modified_event = await plugin_manager.run_on_event_callback(
+        modified_event = await on_event_callback(
             invocation_context=invocation_context, event=event
         )
         yield (modified_event if modified_event else event)
@@ -300,42 +407,44 @@ class Runner:
         new_message: The new message to append.
         invocation_context: The invocation context for the message.
         save_input_blobs_as_artifacts: Whether to save input blobs as artifacts.
+        state_delta: Optional state changes to apply with the message.
     """
     if not new_message.parts:
       raise ValueError('No parts in the new_message.')
 
+    invocation_id = invocation_context.invocation_id
     if self.artifact_service and save_input_blobs_as_artifacts:
       # The runner directly saves the artifacts (if applicable) in the
       # user message and replaces the artifact data with a file name
       # placeholder.
-      for i, part in enumerate(new_message.parts):
-        if part.inline_data is None:
-          continue
-        file_name = f'artifact_{invocation_context.invocation_id}_{i}'
-        await self.artifact_service.save_artifact(
-            app_name=self.app_name,
-            user_id=session.user_id,
-            session_id=session.id,
-            filename=file_name,
-            artifact=part,
-        )
+      file_names = {
+          i: f'artifact_{invocation_id}_{i}'
+          for i, part in enumerate(new_message.parts)
+          if part.inline_data is not None
+      }
+      # Saves the artifacts concurrently as each save is a round trip to the
+      # artifact storage.
+      await asyncio.gather(*(
+          self.artifact_service.save_artifact(
+              app_name=self.app_name,
+              user_id=session.user_id,
+              session_id=session.id,
+              filename=file_name,
+              artifact=new_message.parts[i],
+          )
+          for i, file_name in file_names.items()
+      ))
+      for i, file_name in file_names.items():
         new_message.parts[i] = types.Part(
             text=f'Uploaded file: {file_name}. It is saved into artifacts'
         )
     # Appends only. We do not yield the event because it's not from the model.
-    if state_delta:
-      event = Event(
-          invocation_id=invocation_context.invocation_id,
-          author='user',
-          actions=EventActions(state_delta=state_delta),
-          content=new_message,
-      )
-    else:
-      event = Event(
-          invocation_id=invocation_context.invocation_id,
-          author='user',
-          content=new_message,
-      )
+    event = Event(
+        invocation_id=invocation_id,
+        author='user',
+        actions=EventActions(state_delta=state_delta or {}),
+        content=new_message,
+    )
     await self.session_service.append_event(session=session, event=event)
 
   async def run_live(
@@ -402,45 +511,21 @@ class Runner:
     # TODO(hangfei): switch to use canonical_tools.
     # for shell agents, there is no tools associated with it so we should skip.
     if hasattr(invocation_context.agent, 'tools'):
-      import inspect
-
       for tool in invocation_context.agent.tools:
-        # We use `inspect.signature()` to examine the tool's underlying function (`tool.func`).
-        # This approach is deliberately chosen over `typing.get_type_hints()` for robustness.
-        #
-        # The Problem with `get_type_hints()`:
-        # `get_type_hints()` attempts to resolve forward-referenced (string-based) type
-        # annotations. This resolution can easily fail with a `NameError` (e.g., "Union not found")
-        # if the type isn't available in the scope where `get_type_hints()` is called.
-        # This is a common and brittle issue in framework code that inspects functions
-        # defined in separate user modules.
-        #
-        # Why `inspect.signature()` is Better Here:
-        # `inspect.signature()` does NOT resolve the annotations; it retrieves the raw
-        # annotation object as it was defined on the function. This allows us to
-        # perform a direct and reliable identity check (`param.annotation is LiveRequestQueue`)
-        # without risking a `NameError`.
         callable_to_inspect = tool.func if hasattr(tool, 'func') else tool
         # Ensure the target is actually callable before inspecting to avoid errors.
         if not callable(callable_to_inspect):
           continue
-        for param in inspect.signature(callable_to_inspect).parameters.values():
-          if param.annotation is LiveRequestQueue:
-            if not invocation_context.active_streaming_tools:
-              invocation_context.active_streaming_tools = {}
-            active_streaming_tool = ActiveStreamingTool(
-                stream=LiveRequestQueue()
-            )
-            invocation_context.active_streaming_tools[tool.__name__] = (
-                active_streaming_tool
-            )
-
-    async def execute(ctx: InvocationContext) -> AsyncGenerator[Event]:
-      async for event in ctx.agent.run_live(ctx):
-        yield event
+        if _accepts_live_request_queue(callable_to_inspect):
+          active_streaming_tool = ActiveStreamingTool(stream=LiveRequestQueue())
+          invocation_context.active_streaming_tools[tool.__name__] = (
+              active_streaming_tool
+          )
 
     async for event in self._exec_with_plugin(
-        invocation_context, session, execute
+        invocation_context,
+        session,
+        invocation_context.agent.run_live(invocation_context),
     ):
       yield event
 
@@ -469,18 +554,28 @@ class Runner:
     # the agent that returned the corressponding function call regardless the
     # type of the agent. e.g. a remote a2a agent may surface a credential
     # request as a special long running function tool call.
-    event = find_matching_function_call(session.events)
+    agents_by_name = self._get_agents_by_name(root_agent)
+    events = session.events
+    event = find_matching_function_call(events)
     if event and event.author:
-      return root_agent.find_agent(event.author)
-    for event in filter(lambda e: e.author != 'user', reversed(session.events)):
-      if event.author == root_agent.name:
+      return agents_by_name.get(event.author)
+    root_agent_name = root_agent.name
+    # Authors already ruled out, so that their other events are skipped.
+    skipped_authors = {'user'}
+    for i in range(len(events) - 1, -1, -1):
+      event = events[i]
+      author = event.author
+      if author in skipped_authors:
+        continue
+      if author == root_agent_name:
         # Found root agent.
         return root_agent
-      if not (agent := root_agent.find_sub_agent(event.author)):
+      skipped_authors.add(author)
+      if not (agent := agents_by_name.get(author)):
         # Agent not found, continue looking.
         logger.warning(
             'Event from an unknown agent: %s, event id: %s',
-            event.author,
+            author,
             event.id,
         )
         continue
@@ -489,6 +584,33 @@ class Runner:
     # Falls back to root agent if no suitable agents are found in the session.
     return root_agent
 
+  def _get_agents_by_name(self, root_agent: BaseAgent) -> dict[str, BaseAgent]:
+    """Returns the agents in the tree of `root_agent` indexed by name.
+
+    The index is built once per root agent, as the agent tree is not expected
+    to change while the runner is in use. Building it also flushes the cached
+    transferability of the agents.
+
+    Args:
+        root_agent: The root agent of the tree to index.
+
+    Returns:
+      A mapping from agent name to agent, resolving names like
+      `BaseAgent.find_agent`.
+    """
+    if self._agents_by_name_root is not root_agent:
+      agents_by_name = {}
+      stack = [root_agent]
+      while stack:
+        agent = stack.pop()
+        # Keeps the first agent in depth-first order, like `find_agent`.
+        agents_by_name.setdefault(agent.name, agent)
+        stack.extend(reversed(agent.sub_agents))
+      self._agents_by_name = agents_by_name
+      self._agents_by_name_root = root_agent
+      self._transferable_cache.clear()
+    return self._agents_by_name
+
   def _is_transferable_across_agent_tree(self, agent_to_run: BaseAgent) -> bool:
     """Whether the agent to run can transfer to any other agent in the agent tree.
 
@@ -501,15 +623,42 @@ class Runner:
     Returns:
         True if the agent can transfer, False otherwise.
     """
+    # The results are cached per agent, keyed by id. The cached agent is kept
+    # alive with its result so that the id can't be reused by another agent.
+    cache = self._transferable_cache
+    visited_agents = []
+    transferable = True
     agent = agent_to_run
     while agent:
+      if (cached := cache.get(id(agent))) is not None:
+        transferable = cached[1]
+        break
+      visited_agents.append(agent)
       if not isinstance(agent, LlmAgent):
         # Only LLM-based Agent can provide agent transfer capability.
-        return False
+        transferable = False
+        break
       if agent.disallow_transfer_to_parent:
-        return False
+        transferable = False
+        break
       agent = agent.parent_agent
-    return True
+    # The visited agents all share the result of their closest ancestor that
+    # decided it, as they are all its descendants.
+    for visited_agent in visited_agents:
+      cache[id(visited_agent)] = (visited_agent, transferable)
+    return transferable
+
+  def _get_agent_model_name(self) -> str:
+    """Returns the model name of the root LlmAgent.
+
+    Resolving the canonical model may create a new model instance, so the name
+    is resolved lazily on first use and cached for the current root agent.
+    """
+    cached = self._agent_model_name
+    if cached is None or cached[0] is not self.agent:
+      cached = (self.agent, self.agent.canonical_model.model)
+      self._agent_model_name = cached
+    return cached[1]
 
   def _new_invocation_context(
       self,
@@ -533,7 +682,7 @@ class Runner:
     invocation_id = new_invocation_context_id()
 
     if run_config.support_cfc and isinstance(self.agent, LlmAgent):
-      model_name = self.agent.canonical_model.model
+      model_name = self._get_agent_model_name()
       if not model_name.startswith('gemini-2'):
         raise ValueError(
             f'CFC is not supported for model: {model_name} in agent:'
@@ -591,34 +740,58 @@ class Runner:
 
   def _collect_toolset(self, agent: BaseAgent) -> set[BaseToolset]:
     toolsets = set()
-    if isinstance(agent, LlmAgent):
-      for tool_union in agent.tools:
-        if isinstance(tool_union, BaseToolset):
-          toolsets.add(tool_union)
-    for sub_agent in agent.sub_agents:
-      toolsets.update(self._collect_toolset(sub_agent))
+    stack = [agent]
+    while stack:
+      current_agent = stack.pop()
+      if isinstance(current_agent, LlmAgent):
+        toolsets.update(
+            tool_union
+            for tool_union in current_agent.tools
+            if isinstance(tool_union, BaseToolset)
+        )
+      stack.extend(current_agent.sub_agents)
     return toolsets
 
+  def invalidate_toolset_cache(self):
+    """Clears the cached toolsets of the agent tree.
+
+    The toolsets closed by `close` are collected once and cached. Call this
+    after changing the tools or sub agents of the runner's agent tree.
+    """
+    self._cached_toolsets = None
+
   async def _cleanup_toolsets(self, toolsets_to_close: set[BaseToolset]):
     """Clean up toolsets with proper task context management."""
     if not toolsets_to_close:
       return
 
-    # This maintains the same task context throughout cleanup
-    for toolset in toolsets_to_close:
-      try:
-        logger.info('Closing toolset: %s', type(toolset).__name__)
-        # Use asyncio.wait_for to add timeout protection
-        await asyncio.wait_for(toolset.close(), timeout=10.0)
-        logger.info('Successfully closed toolset: %s', type(toolset).__name__)
-      except asyncio.TimeoutError:
+    # Closes the toolsets concurrently so that shutdown takes as long as the
+    # slowest toolset rather than the sum of all of them.
+    toolsets = list(toolsets_to_close)
+    tasks = []
+    for toolset in toolsets:
+      logger.info('Closing toolset: %s', type(toolset).__name__)
+      # Use asyncio.wait_for to add timeout protection
+      tasks.append(
+          asyncio.create_task(asyncio.wait_for(toolset.close(), timeout=10.0))
+      )
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for toolset, result in zip(toolsets, results):
+      if isinstance(result, asyncio.TimeoutError):
         logger.warning('Toolset %s cleanup timed out', type(toolset).__name__)
-      except Exception as e:
-        logger.error('Error closing toolset %s: %s', type(toolset).__name__, e)
+      elif isinstance(result, Exception):
+        logger.error(
+            'Error closing toolset %s: %s', type(toolset).__name__, result
+        )
+      else:
+        logger.info('Successfully closed toolset: %s', type(toolset).__name__)
 
   async def close(self):
     """Closes the runner."""
-    await self._cleanup_toolsets(self._collect_toolset(self.agent))
+    if self._cached_toolsets is None:
+      self._cached_toolsets = self._collect_toolset(self.agent)
+    await self._cleanup_toolsets(self._cached_toolsets)
 
 
 class InMemoryRunner(Runner):
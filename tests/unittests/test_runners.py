@@ -12,17 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from typing import Optional
 
 from google.adk.agents.base_agent import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.live_request_queue import LiveRequestQueue
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.run_config import RunConfig
 from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+from google.adk.code_executors.built_in_code_executor import BuiltInCodeExecutor
 from google.adk.events.event import Event
 from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import _accepts_live_request_queue
 from google.adk.runners import Runner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.adk.sessions.session import Session
+from google.adk.tools.base_toolset import BaseToolset
 from google.genai import types
 import pytest
 
@@ -79,6 +85,38 @@ class MockLlmAgent(LlmAgent):
     )
 
 
+class MockManyEventsAgent(BaseAgent):
+  """Mock agent that yields a given number of events."""
+
+  num_events: int = 1
+
+  async def _run_async_impl(self, invocation_context):
+    for i in range(self.num_events):
+      yield Event(
+          invocation_id=invocation_context.invocation_id,
+          author=self.name,
+          content=types.Content(role="model", parts=[types.Part(text=str(i))]),
+      )
+
+
+class MockToolset(BaseToolset):
+  """Mock toolset for unit testing."""
+
+  def __init__(self, error: Optional[Exception] = None):
+    super().__init__()
+    self.error = error
+    self.closed = False
+
+  async def get_tools(self, readonly_context=None):
+    return []
+
+  async def close(self):
+    await asyncio.sleep(0)
+    if self.error:
+      raise self.error
+    self.closed = True
+
+
 class MockPlugin(BasePlugin):
   """Mock plugin for unit testing."""
 
@@ -249,6 +287,28 @@ class TestRunnerFindAgentToRun:
     result = self.runner._find_agent_to_run(session, self.root_agent)
     assert result == self.sub_agent1
 
+  def test_find_agent_to_run_returns_nested_sub_agent(self):
+    """Test that a transferable agent deeper in the tree is returned."""
+    nested_agent = MockLlmAgent("nested_agent", parent_agent=self.sub_agent1)
+    self.sub_agent1.sub_agents = [nested_agent]
+    session = Session(
+        id="test_session",
+        user_id="test_user",
+        app_name="test_app",
+        events=[
+            Event(
+                invocation_id="inv1",
+                author="nested_agent",
+                content=types.Content(
+                    role="model", parts=[types.Part(text="Nested response")]
+                ),
+            )
+        ],
+    )
+
+    result = self.runner._find_agent_to_run(session, self.root_agent)
+    assert result == nested_agent
+
   def test_find_agent_to_run_skips_non_transferable_agent(self):
     """Test that non-transferable agent is skipped and root agent is returned."""
     session = Session(
@@ -298,6 +358,32 @@ class TestRunnerFindAgentToRun:
     result = self.runner._find_agent_to_run(session, self.root_agent)
     assert result == self.root_agent
 
+  def test_find_agent_to_run_checks_each_author_once(self, caplog):
+    """Test that repeated events from a skipped author are only checked once."""
+    events = [
+        Event(
+            invocation_id=f"inv{i}",
+            author=author,
+            content=types.Content(
+                role="model", parts=[types.Part(text="Response")]
+            ),
+        )
+        for i, author in enumerate(
+            ["sub_agent1", "unknown_agent", "non_transferable"] * 3
+        )
+    ]
+    session = Session(
+        id="test_session",
+        user_id="test_user",
+        app_name="test_app",
+        events=events,
+    )
+
+    result = self.runner._find_agent_to_run(session, self.root_agent)
+
+    assert result == self.sub_agent1
+    assert caplog.text.count("Event from an unknown agent") == 1
+
   def test_find_agent_to_run_function_response_takes_precedence(self):
     """Test that function response scenario takes precedence over other logic."""
     # Create a function call from sub_agent2
@@ -354,6 +440,24 @@ class TestRunnerFindAgentToRun:
     )
     assert result is False
 
+  def test_is_transferable_across_agent_tree_with_cached_ancestors(self):
+    """Test _is_transferable_across_agent_tree reusing ancestor results."""
+    nested_agent = MockLlmAgent(
+        "nested_agent", parent_agent=self.non_transferable_agent
+    )
+    transferable_nested_agent = MockLlmAgent(
+        "transferable_nested_agent", parent_agent=self.sub_agent1
+    )
+
+    assert not self.runner._is_transferable_across_agent_tree(nested_agent)
+    assert not self.runner._is_transferable_across_agent_tree(
+        self.non_transferable_agent
+    )
+    assert self.runner._is_transferable_across_agent_tree(self.sub_agent1)
+    assert self.runner._is_transferable_across_agent_tree(
+        transferable_nested_agent
+    )
+
   def test_is_transferable_across_agent_tree_with_non_llm_agent(self):
     """Test _is_transferable_across_agent_tree with non-LLM agent."""
     non_llm_agent = MockAgent("non_llm_agent")
@@ -428,5 +532,224 @@ class TestRunnerWithPlugins:
     assert modified_event_message == MockPlugin.ON_EVENT_CALLBACK_MSG
 
 
+class TestRunnerRun:
+  """Tests for the sync Runner.run method."""
+
+  def setup_method(self):
+    self.session_service = InMemorySessionService()
+    self.runner = Runner(
+        app_name=TEST_APP_ID,
+        agent=MockAgent("root_agent"),
+        session_service=self.session_service,
+    )
+    asyncio.run(
+        self.session_service.create_session(
+            app_name=TEST_APP_ID,
+            user_id=TEST_USER_ID,
+            session_id=TEST_SESSION_ID,
+        )
+    )
+
+  def _run(self) -> list[Event]:
+    return list(
+        self.runner.run(
+            user_id=TEST_USER_ID,
+            session_id=TEST_SESSION_ID,
+            new_message=types.Content(
+                role="user", parts=[types.Part(text="Hello")]
+            ),
+        )
+    )
+
+  def test_run_yields_events_across_calls(self):
+    """Test that consecutive sync runs yield the agent events."""
+    for _ in range(2):
+      events = self._run()
+      assert len(events) == 1
+      assert events[0].author == "root_agent"
+      assert events[0].content.parts[0].text == "Test response"
+
+  def test_run_yields_more_events_than_the_buffer_size(self):
+    """Test that all events are yielded in order when the buffer fills up."""
+    self.runner.agent = MockManyEventsAgent(name="root_agent", num_events=600)
+
+    events = self._run()
+
+    assert [event.content.parts[0].text for event in events] == [
+        str(i) for i in range(600)
+    ]
+
+  def test_run_stops_when_the_caller_stops_early(self):
+    """Test that the caller can stop consuming events before the run ends."""
+    self.runner.agent = MockManyEventsAgent(name="root_agent", num_events=600)
+    events = self.runner.run(
+        user_id=TEST_USER_ID,
+        session_id=TEST_SESSION_ID,
+        new_message=types.Content(role="user", parts=[types.Part(text="Hi")]),
+    )
+
+    assert next(events).content.parts[0].text == "0"
+    events.close()
+
+    assert [event.content.parts[0].text for event in self._run()][-1] == "599"
+
+  def test_run_raises_agent_errors(self):
+    """Test that errors raised while running surface to the caller."""
+    with pytest.raises(ValueError, match="Session not found"):
+      list(
+          self.runner.run(
+              user_id=TEST_USER_ID,
+              session_id="missing_session",
+              new_message=types.Content(
+                  role="user", parts=[types.Part(text="Hello")]
+              ),
+          )
+      )
+
+
+@pytest.mark.asyncio
+async def test_close_closes_all_toolsets():
+  """Test that closing the runner closes every toolset in the agent tree."""
+  root_toolset = MockToolset()
+  failing_toolset = MockToolset(error=RuntimeError("close failed"))
+  sub_toolset = MockToolset()
+  sub_agent = LlmAgent(
+      name="sub_agent", model="gemini-1.5-pro", tools=[sub_toolset]
+  )
+  root_agent = LlmAgent(
+      name="root_agent",
+      model="gemini-1.5-pro",
+      tools=[root_toolset, failing_toolset],
+      sub_agents=[sub_agent],
+  )
+  runner = Runner(
+      app_name=TEST_APP_ID,
+      agent=root_agent,
+      session_service=InMemorySessionService(),
+  )
+
+  await runner.close()
+
+  assert root_toolset.closed
+  assert sub_toolset.closed
+  assert not failing_toolset.closed
+
+
+@pytest.mark.asyncio
+async def test_close_collects_toolsets_again_after_invalidation():
+  """Test that invalidating the toolset cache picks up newly added toolsets."""
+  first_toolset = MockToolset()
+  root_agent = LlmAgent(
+      name="root_agent", model="gemini-1.5-pro", tools=[first_toolset]
+  )
+  runner = Runner(
+      app_name=TEST_APP_ID,
+      agent=root_agent,
+      session_service=InMemorySessionService(),
+  )
+  await runner.close()
+  assert first_toolset.closed
+
+  second_toolset = MockToolset()
+  root_agent.tools.append(second_toolset)
+  await runner.close()
+  assert not second_toolset.closed
+
+  runner.invalidate_toolset_cache()
+  await runner.close()
+  assert second_toolset.closed
+
+
+@pytest.mark.asyncio
+async def test_run_async_saves_input_blobs_as_artifacts():
+  """Test that inline data parts are saved as artifacts and replaced."""
+  session_service = InMemorySessionService()
+  artifact_service = InMemoryArtifactService()
+  runner = Runner(
+      app_name=TEST_APP_ID,
+      agent=MockAgent("root_agent"),
+      session_service=session_service,
+      artifact_service=artifact_service,
+  )
+  await session_service.create_session(
+      app_name=TEST_APP_ID, user_id=TEST_USER_ID, session_id=TEST_SESSION_ID
+  )
+  blob = types.Part.from_bytes(data=b"data", mime_type="text/plain")
+
+  async for _ in runner.run_async(
+      user_id=TEST_USER_ID,
+      session_id=TEST_SESSION_ID,
+      new_message=types.Content(
+          role="user", parts=[blob, types.Part(text="Hello"), blob]
+      ),
+      run_config=RunConfig(save_input_blobs_as_artifacts=True),
+  ):
+    pass
+
+  session = await session_service.get_session(
+      app_name=TEST_APP_ID, user_id=TEST_USER_ID, session_id=TEST_SESSION_ID
+  )
+  user_parts = session.events[0].content.parts
+  invocation_id = session.events[0].invocation_id
+  assert user_parts[1].text == "Hello"
+  for i in (0, 2):
+    file_name = f"artifact_{invocation_id}_{i}"
+    assert user_parts[i].text == (
+        f"Uploaded file: {file_name}. It is saved into artifacts"
+    )
+    artifact = await artifact_service.load_artifact(
+        app_name=TEST_APP_ID,
+        user_id=TEST_USER_ID,
+        session_id=TEST_SESSION_ID,
+        filename=file_name,
+    )
+    assert artifact.inline_data.data == b"data"
+
+
+def test_new_invocation_context_with_cfc():
+  """Test that CFC checks the root agent model and sets the code executor."""
+  session = Session(
+      id=TEST_SESSION_ID, user_id=TEST_USER_ID, app_name=TEST_APP_ID
+  )
+  runner = Runner(
+      app_name=TEST_APP_ID,
+      agent=LlmAgent(name="root_agent", model="gemini-2.0-flash"),
+      session_service=InMemorySessionService(),
+  )
+
+  for _ in range(2):
+    runner._new_invocation_context(
+        session, run_config=RunConfig(support_cfc=True)
+    )
+    assert isinstance(runner.agent.code_executor, BuiltInCodeExecutor)
+
+  runner.agent = LlmAgent(name="root_agent", model="gemini-1.5-pro")
+  with pytest.raises(ValueError, match="CFC is not supported"):
+    runner._new_invocation_context(
+        session, run_config=RunConfig(support_cfc=True)
+    )
+
+
+def test_accepts_live_request_queue():
+  """Test detection of tools taking a LiveRequestQueue parameter."""
+
+  def streaming_tool(stream: LiveRequestQueue) -> str:
+    return ""
+
+  def plain_tool(query: str) -> str:
+    return query
+
+  class UnhashableTool:
+    __hash__ = None
+
+    def __call__(self, stream: LiveRequestQueue) -> str:
+      return ""
+
+  assert _accepts_live_request_queue(streaming_tool)
+  assert _accepts_live_request_queue(streaming_tool)
+  assert not _accepts_live_request_queue(plain_tool)
+  assert _accepts_live_request_queue(UnhashableTool())
+
+
 if __name__ == "__main__":
   pytest.main([__file__])